@@ -1,9 +1,150 @@
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 import azure.functions as func
+import orjson
 
 from .azure_diet_processor import AzureDietDataProcessor
 
+# Loaded processor shared across invocations on a warm worker. It is reused
+# while the source blob's ETag is unchanged and the entry is younger than the TTL.
+_CACHE_TTL_SECONDS = 300
+_PROCESSOR_CACHE = {"proc": None, "etag": None, "loaded_at": 0}
+_PROCESSOR_LOCK = threading.Lock()
+
+# Serialized responses of operations whose output depends only on the loaded
+# data, keyed by (blob ETag, operation, query params) and evicted LRU-first
+_CACHEABLE_OPERATIONS = {
+    "summary",
+    "macronutrients",
+    "comparison",
+    "cuisine-distribution",
+    "nutrient-ranges",
+}
+_RESPONSE_CACHE_SIZE = 256
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _get_processor() -> Optional[AzureDietDataProcessor]:
+    """Return a processor with data loaded, or None if loading failed"""
+    cached = _PROCESSOR_CACHE["proc"]
+    etag = cached.get_blob_etag() if cached is not None else None
+
+    with _PROCESSOR_LOCK:
+        current = _PROCESSOR_CACHE["proc"]
+        if current is not None:
+            # Another invocation reloaded the data while we waited for the lock
+            if current is not cached:
+                return current
+            is_fresh = (
+                time.monotonic() - _PROCESSOR_CACHE["loaded_at"] < _CACHE_TTL_SECONDS
+            )
+            if is_fresh and etag is not None and etag == _PROCESSOR_CACHE["etag"]:
+                return current
+
+        processor = AzureDietDataProcessor()
+        if not processor.load_data_from_blob(etag=etag):
+            return None
+
+        _PROCESSOR_CACHE.update(
+            proc=processor, etag=processor.etag, loaded_at=time.monotonic()
+        )
+        return processor
+
+
+def _get_cached_response(key: Tuple) -> Optional[bytes]:
+    """Return the cached response body for key, if any"""
+    with _RESPONSE_CACHE_LOCK:
+        body = _RESPONSE_CACHE.get(key)
+        if body is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+        return body
+
+
+def _cache_response(key: Tuple, body: bytes):
+    """Store a response body, evicting the least recently used entry when full"""
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[key] = body
+        _RESPONSE_CACHE.move_to_end(key)
+        if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+
+def _handle_chart_data(processor, req):
+    # Get data formatted for specific chart types
+    chart_type = req.params.get("type", "bar")
+    return processor.get_chart_data(chart_type)
+
+
+def _handle_recipes(processor, req):
+    # Enhanced recipes endpoint with pagination and filtering
+    page = int(req.params.get("page", 1))
+    page_size = int(req.params.get("page_size", 20))
+    diet_type = req.params.get("diet_type", "")
+    search_term = req.params.get("search", "")
+    return processor.get_recipes_paginated(page, page_size, diet_type, search_term)
+
+
+def _handle_scatter_plot(processor, req):
+    # Scatter plot data: Nutrient relationships
+    x_nutrient = req.params.get("x", "Protein")
+    y_nutrient = req.params.get("y", "Carbs")
+    return processor.get_scatter_plot_data(x_nutrient, y_nutrient)
+
+
+def _handle_top_recipes(processor, req):
+    nutrient = req.params.get("nutrient", "Protein")
+    try:
+        n = int(req.params.get("n", 10))
+    except (TypeError, ValueError):
+        n = 10
+    n = max(1, min(n, 100))
+    return processor.get_top_recipes_by_nutrient(nutrient, n)
+
+
+def _handle_recipes_by_diet_type(processor, req):
+    operation = (req.route_params.get("operation") or "").lower()
+    diet_type = operation.replace("recipes/", "")
+    return processor.get_recipes_by_diet_type(diet_type)
+
+
+def _handle_search(processor, req):
+    search_term = req.params.get("term", "")
+    search_field = req.params.get("field", "Recipe_name")
+    return processor.search_recipes(search_term, search_field)
+
+
+# Operation name -> handler(processor, req) returning the result
+_HANDLERS = {
+    # Main API for dashboard - returns comprehensive nutritional insights
+    "nutritional-insights": lambda p, req: p.get_nutritional_insights(),
+    "chart-data": _handle_chart_data,
+    "recipes": _handle_recipes,
+    # Clustering analysis for recipe grouping
+    "clusters": lambda p, req: p.get_recipe_clusters(),
+    # Get available diet types for filter dropdown
+    "diet-types": lambda p, req: p.get_diet_types(),
+    # Bar chart data: Average macronutrient content by diet type
+    "bar-chart": lambda p, req: p.get_bar_chart_data(),
+    "scatter-plot": _handle_scatter_plot,
+    # Heatmap data: Nutrient correlations
+    "heatmap": lambda p, req: p.get_heatmap_data(),
+    # Pie chart data: Recipe distribution by diet type
+    "pie-chart": lambda p, req: p.get_pie_chart_data(),
+    "summary": lambda p, req: p.get_diet_summary(),
+    "macronutrients": lambda p, req: p.get_macronutrient_averages(),
+    "comparison": lambda p, req: p.get_diet_comparison_data(),
+    "top-recipes": _handle_top_recipes,
+    "cuisine-distribution": lambda p, req: p.get_cuisine_distribution(),
+    "nutrient-ranges": lambda p, req: p.get_nutrient_ranges(),
+    "search": _handle_search,
+}
+
 
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -39,11 +180,9 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
                 headers=cors_headers,
             )
 
-        # Initialize the processor
-        processor = AzureDietDataProcessor()
-
-        # Load data from Azure Blob Storage
-        if not processor.load_data_from_blob():
+        # Get a processor with data loaded from Azure Blob Storage
+        processor = _get_processor()
+        if processor is None:
             return func.HttpResponse(
                 json.dumps({"error": "Failed to load data from blob storage"}),
                 status_code=500,
@@ -51,91 +190,34 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
                 headers=cors_headers,
             )
 
-        # Route to appropriate function based on operation
-        if operation == "nutritional-insights":
-            # Main API for dashboard - returns comprehensive nutritional insights
-            result = processor.get_nutritional_insights()
-
-        elif operation == "chart-data":
-            # Get data formatted for specific chart types
-            chart_type = req.params.get("type", "bar")
-            result = processor.get_chart_data(chart_type)
-
-        elif operation == "recipes":
-            # Enhanced recipes endpoint with pagination and filtering
-            page = int(req.params.get("page", 1))
-            page_size = int(req.params.get("page_size", 20))
-            diet_type = req.params.get("diet_type", "")
-            search_term = req.params.get("search", "")
-            result = processor.get_recipes_paginated(
-                page, page_size, diet_type, search_term
-            )
-
-        elif operation == "clusters":
-            # Clustering analysis for recipe grouping
-            result = processor.get_recipe_clusters()
-
-        elif operation == "diet-types":
-            # Get available diet types for filter dropdown
-            result = processor.get_diet_types()
-
-        elif operation == "bar-chart":
-            # Bar chart data: Average macronutrient content by diet type
-            result = processor.get_bar_chart_data()
-
-        elif operation == "scatter-plot":
-            # Scatter plot data: Nutrient relationships
-            x_nutrient = req.params.get("x", "Protein")
-            y_nutrient = req.params.get("y", "Carbs")
-            result = processor.get_scatter_plot_data(x_nutrient, y_nutrient)
-
-        elif operation == "heatmap":
-            # Heatmap data: Nutrient correlations
-            result = processor.get_heatmap_data()
-
-        elif operation == "pie-chart":
-            # Pie chart data: Recipe distribution by diet type
-            result = processor.get_pie_chart_data()
-
-        elif operation == "summary":
-            result = processor.get_diet_summary()
-
-        elif operation == "macronutrients":
-            result = processor.get_macronutrient_averages()
-
-        elif operation == "comparison":
-            result = processor.get_diet_comparison_data()
-
-        elif operation == "top-recipes":
-            nutrient = req.params.get("nutrient", "Protein")
-            try:
-                n = int(req.params.get("n", 10))
-            except (TypeError, ValueError):
-                n = 10
-            n = max(1, min(n, 100))
-            result = processor.get_top_recipes_by_nutrient(nutrient, n)
-
-        elif operation == "cuisine-distribution":
-            result = processor.get_cuisine_distribution()
-
-        elif operation == "nutrient-ranges":
-            result = processor.get_nutrient_ranges()
-
-        elif operation.startswith("recipes/"):
-            diet_type = operation.replace("recipes/", "")
-            result = processor.get_recipes_by_diet_type(diet_type)
-
-        elif operation == "search":
-            search_term = req.params.get("term", "")
-            search_field = req.params.get("field", "Recipe_name")
-            if not search_term:
+        # Serve repeat requests for the same data straight from the cache
+        cache_key = None
+        if operation in _CACHEABLE_OPERATIONS and processor.etag:
+            cache_key = (processor.etag, operation, tuple(sorted(req.params.items())))
+            body = _get_cached_response(cache_key)
+            if body is not None:
                 return func.HttpResponse(
-                    json.dumps({"error": "Search term is required"}),
-                    status_code=400,
+                    body,
+                    status_code=200,
                     mimetype="application/json",
                     headers=cors_headers,
                 )
-            result = processor.search_recipes(search_term, search_field)
+
+        # Route to appropriate function based on operation
+        handler = _HANDLERS.get(operation)
+        if handler is None and operation.startswith("recipes/"):
+            handler = _handle_recipes_by_diet_type
+
+        if operation == "search" and not req.params.get("term", ""):
+            return func.HttpResponse(
+                json.dumps({"error": "Search term is required"}),
+                status_code=400,
+                mimetype="application/json",
+                headers=cors_headers,
+            )
+
+        if handler is not None:
+            result = handler(processor, req)
 
         else:
             # Default: return available operations
@@ -174,8 +256,17 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
                 },
             }
 
+        # Indentation only on request; it inflates the payload noticeably
+        json_options = orjson.OPT_SERIALIZE_NUMPY
+        if req.params.get("pretty", "").lower() in ("1", "true"):
+            json_options |= orjson.OPT_INDENT_2
+
+        body = orjson.dumps(result, option=json_options)
+        if cache_key is not None:
+            _cache_response(cache_key, body)
+
         return func.HttpResponse(
-            json.dumps(result, indent=2),
+            body,
             status_code=200,
             mimetype="application/json",
             headers=cors_headers,
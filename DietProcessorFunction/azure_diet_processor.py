@@ -2,11 +2,142 @@ import pandas as pd
 import numpy as np
 import os
 import io
+import csv
+import hashlib
 import logging
-from typing import Dict, List, Optional, Union
+import stat
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import ResourceNotFoundError
 
+# Columns used by the processor; anything else in the source file is skipped
+DATA_COLUMNS = [
+    "Recipe_name",
+    "Diet_type",
+    "Cuisine_type",
+    "Protein(g)",
+    "Carbs(g)",
+    "Fat(g)",
+]
+
+# Free-text columns that get a lowercase copy (suffixed with LOWERCASE_SUFFIX)
+# for search; categorical columns are matched on their categories instead
+SEARCH_COLUMNS = ["Recipe_name"]
+LOWERCASE_SUFFIX = "__lc"
+
+# Types of the numeric columns, declared up front so CSV parsing skips inference
+CSV_DTYPES = {"Protein(g)": "float64", "Carbs(g)": "float64", "Fat(g)": "float64"}
+
+PARQUET_MAGIC = b"PAR1"
+
+# Free-text columns are kept as Arrow-backed strings: one contiguous buffer
+# per column instead of a Python object per value
+ARROW_STRING = pd.StringDtype("pyarrow")
+
+# API field names for the recipe columns returned by the recipe endpoints
+RECIPE_FIELDS = {
+    "Recipe_name": "recipe_name",
+    "Diet_type": "diet_type",
+    "Cuisine_type": "cuisine_type",
+    "Protein(g)": "protein",
+    "Carbs(g)": "carbs",
+    "Fat(g)": "fat",
+}
+
+# Blob download tuning: request size for the first and subsequent GETs, and
+# the number of parallel connections used when buffering a whole blob
+MAX_SINGLE_GET_SIZE = 4 * 1024 * 1024
+MAX_CHUNK_GET_SIZE = 4 * 1024 * 1024
+DOWNLOAD_CONCURRENCY = 8
+
+# Maximum number of result blobs uploaded in parallel by upload_many_results
+UPLOAD_CONCURRENCY = 8
+
+# Local Parquet copies of downloaded blobs, keyed by blob ETag, so a restarted
+# worker on the same host skips the download while the blob is unchanged.
+# Set the DIET_DATA_CACHE_DIR app setting to move it out of the temp directory
+LOCAL_CACHE_DIR = os.getenv("DIET_DATA_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), "diet-data-cache"
+)
+
+# Part of every local cache file name, so copies written with a different
+# column projection or parse types are never read back
+LOCAL_CACHE_VERSION = hashlib.sha1(
+    repr((DATA_COLUMNS, sorted(CSV_DTYPES.items()))).encode()
+).hexdigest()[:12]
+
+# Blob service clients shared by all processors in this worker, keyed by
+# connection string, so the HTTP connection pool and TLS sessions stay warm
+_BLOB_SERVICE_CLIENTS: Dict[str, BlobServiceClient] = {}
+_BLOB_SERVICE_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_blob_service_client(connection_string: str) -> BlobServiceClient:
+    """Return the shared blob service client for a connection string"""
+    with _BLOB_SERVICE_CLIENTS_LOCK:
+        client = _BLOB_SERVICE_CLIENTS.get(connection_string)
+        if client is None:
+            client = BlobServiceClient.from_connection_string(
+                connection_string,
+                max_single_get_size=MAX_SINGLE_GET_SIZE,
+                max_chunk_get_size=MAX_CHUNK_GET_SIZE,
+            )
+            _BLOB_SERVICE_CLIENTS[connection_string] = client
+        return client
+
+
+def _get_local_cache_dir() -> Optional[str]:
+    """Create the local cache directory and return it, or None if it is unsafe"""
+    try:
+        os.makedirs(LOCAL_CACHE_DIR, mode=0o700, exist_ok=True)
+        info = os.lstat(LOCAL_CACHE_DIR)
+    except OSError as e:
+        logging.warning(f"Local cache directory {LOCAL_CACHE_DIR} unavailable: {e}")
+        return None
+
+    # Cached files are loaded as source data, so only trust a real directory
+    # that this user owns and nobody else can write to
+    is_private = stat.S_ISDIR(info.st_mode) and (
+        os.name != "posix" or (info.st_uid == os.getuid() and not info.st_mode & 0o022)
+    )
+    if not is_private:
+        logging.warning(
+            f"Not using local cache directory {LOCAL_CACHE_DIR}: "
+            "it is not a directory private to this user"
+        )
+        return None
+
+    return LOCAL_CACHE_DIR
+
+
+class _BlobChunkStream(io.RawIOBase):
+    """Read-only file object over the chunks of a blob download"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
 
 class AzureDietDataProcessor:
     """
@@ -24,8 +155,12 @@ class AzureDietDataProcessor:
             container_name: Name of the blob container containing the data
         """
         self.data = None
+        self.etag = None
+        self._by_diet = {}
+        self._summary = {}
+        self._macro_averages = None
         self.container_name = container_name
-        self.blob_name = "All_Diets.csv"
+        self.blob_name = "All_Diets.parquet"
 
         # Get connection string from parameter or environment variable
         self.connection_string = connection_string or os.getenv("AzureWebJobsStorage")
@@ -37,19 +172,20 @@ class AzureDietDataProcessor:
 
         # Initialize blob service client
         try:
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
+            self.blob_service_client = _get_blob_service_client(self.connection_string)
         except Exception as e:
             logging.error(f"Failed to initialize blob service client: {e}")
             raise
 
-    def load_data_from_blob(self, blob_name: Optional[str] = None) -> bool:
+    def load_data_from_blob(
+        self, blob_name: Optional[str] = None, etag: Optional[str] = None
+    ) -> bool:
         """
         Load diet data from Azure Blob Storage
 
         Args:
-            blob_name: Name of the blob file (defaults to All_Diets.csv)
+            blob_name: Name of the blob file (defaults to All_Diets.parquet)
+            etag: Current ETag of the blob, if the caller already has it
 
         Returns:
             bool: True if data loaded successfully, False otherwise
@@ -57,19 +193,22 @@ class AzureDietDataProcessor:
         try:
             blob_name = blob_name or self.blob_name
 
-            # Get blob client
-            blob_client = self.blob_service_client.get_blob_client(
-                container=self.container_name, blob=blob_name
-            )
-
-            # Download blob content
-            logging.info(
-                f"Downloading blob: {blob_name} from container: {self.container_name}"
-            )
-            blob_data = blob_client.download_blob().readall()
+            # Reuse the local copy when the blob has not changed since it was cached
+            etag = etag or self.get_blob_etag(blob_name)
+            cached_data = self._read_local_cache(blob_name, etag) if etag else None
+            if cached_data is not None:
+                self.data = cached_data
+                self.etag = etag
+            else:
+                blob_client = self.blob_service_client.get_blob_client(
+                    container=self.container_name, blob=blob_name
+                )
 
-            # Load into pandas DataFrame
-            self.data = pd.read_csv(io.BytesIO(blob_data))
+                # Load into pandas DataFrame
+                self.data = self._read_dataframe(
+                    lambda: self._open_blob_stream(blob_client, blob_name)
+                )
+                self._write_local_cache(blob_name, self.etag)
             logging.info(
                 f"Successfully loaded {len(self.data)} records from blob storage"
             )
@@ -87,6 +226,100 @@ class AzureDietDataProcessor:
             logging.error(f"Error loading data from blob storage: {e}")
             return False
 
+    def _open_blob_stream(self, blob_client, blob_name: str) -> io.BufferedReader:
+        """Start downloading a blob and return a stream over its content"""
+        logging.info(
+            f"Downloading blob: {blob_name} from container: {self.container_name}"
+        )
+        downloader = blob_client.download_blob(max_concurrency=DOWNLOAD_CONCURRENCY)
+        self.etag = downloader.properties.etag
+
+        if blob_name.endswith(".parquet"):
+            # Parquet needs random access to its footer, so buffer the
+            # whole blob using parallel range requests
+            stream = io.BytesIO()
+            downloader.readinto(stream)
+            stream.seek(0)
+        else:
+            # Parse CSV while the remaining chunks are still downloading
+            stream = _BlobChunkStream(downloader.chunks())
+
+        return io.BufferedReader(stream)
+
+    def get_blob_etag(self, blob_name: Optional[str] = None) -> Optional[str]:
+        """
+        Get the current ETag of the source blob without downloading it
+
+        Args:
+            blob_name: Name of the blob file (defaults to All_Diets.parquet)
+
+        Returns:
+            str: The blob ETag, or None if it could not be retrieved
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=blob_name or self.blob_name
+            )
+            return blob_client.get_blob_properties().etag
+        except Exception as e:
+            logging.error(f"Error reading blob properties: {e}")
+            return None
+
+    def _local_cache_path(self, blob_name: str, etag: str) -> str:
+        """Path of the local Parquet copy of a blob at the given ETag"""
+        blob_key = hashlib.sha1(f"{self.container_name}/{blob_name}".encode())
+        etag_key = hashlib.sha1(f"{LOCAL_CACHE_VERSION}/{etag}".encode())
+        return os.path.join(
+            LOCAL_CACHE_DIR, f"{blob_key.hexdigest()}-{etag_key.hexdigest()}.parquet"
+        )
+
+    def _read_local_cache(self, blob_name: str, etag: str) -> Optional[pd.DataFrame]:
+        """Read the local copy of a blob at the given ETag, or None if unavailable"""
+        if _get_local_cache_dir() is None:
+            return None
+
+        cache_path = self._local_cache_path(blob_name, etag)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            data = pq.read_table(cache_path).to_pandas()
+            logging.info(f"Loading blob: {blob_name} from local cache")
+            return data
+        except Exception as e:
+            # The copy is only an optimisation; drop it and download instead
+            logging.warning(f"Discarding unreadable local cache for {blob_name}: {e}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+
+    def _write_local_cache(self, blob_name: str, etag: Optional[str]):
+        """Save the loaded data as the local copy of a blob, replacing older versions"""
+        if not etag or _get_local_cache_dir() is None:
+            return
+
+        cache_path = self._local_cache_path(blob_name, etag)
+        # Write under a unique name and rename, so readers never see a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            pq.write_table(
+                pa.Table.from_pandas(self.data, preserve_index=False), tmp_path
+            )
+            os.replace(tmp_path, cache_path)
+
+            blob_prefix = os.path.basename(cache_path).split("-", 1)[0] + "-"
+            for name in os.listdir(LOCAL_CACHE_DIR):
+                path = os.path.join(LOCAL_CACHE_DIR, name)
+                stale = name.startswith(blob_prefix) and name.endswith(".parquet")
+                if stale and path != cache_path:
+                    os.remove(path)
+        except Exception as e:
+            logging.warning(f"Could not cache blob {blob_name} locally: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     def load_data_from_content(self, content: bytes) -> bool:
         """
         Load diet data from blob content (useful for blob triggers)
@@ -98,7 +331,9 @@ class AzureDietDataProcessor:
             bool: True if data loaded successfully, False otherwise
         """
         try:
-            self.data = pd.read_csv(io.BytesIO(content))
+            self.data = self._read_dataframe(
+                lambda: io.BufferedReader(io.BytesIO(content))
+            )
             logging.info(
                 f"Successfully loaded {len(self.data)} records from blob content"
             )
@@ -111,6 +346,60 @@ class AzureDietDataProcessor:
             logging.error(f"Error loading data from blob content: {e}")
             return False
 
+    def _read_dataframe(
+        self, open_stream: Callable[[], io.BufferedReader]
+    ) -> pd.DataFrame:
+        """
+        Parse Parquet or CSV content into a DataFrame
+
+        Args:
+            open_stream: Returns a new stream over the content; called again
+                if the CSV has to be re-parsed with the C engine
+
+        Returns:
+            pd.DataFrame: The parsed data, limited to DATA_COLUMNS
+        """
+        stream = open_stream()
+        if stream.peek(len(PARQUET_MAGIC)).startswith(PARQUET_MAGIC):
+            source = stream if stream.seekable() else io.BytesIO(stream.read())
+            available = set(pq.read_schema(source).names)
+            columns = [col for col in DATA_COLUMNS if col in available]
+            source.seek(0)
+            return pq.read_table(source, columns=columns).to_pandas()
+
+        try:
+            return self._read_csv(stream)
+        except (pa.ArrowInvalid, pd.errors.ParserError) as e:
+            # The pyarrow engine rejects short or ragged rows, which the C
+            # engine pads with NaN; the first stream is consumed, so reopen it
+            logging.warning(f"Re-parsing CSV with the C engine: {e}")
+            return self._read_csv_c_engine(open_stream())
+
+    def _read_csv(self, stream: io.BufferedReader) -> pd.DataFrame:
+        """Parse CSV content, reading only the columns in DATA_COLUMNS"""
+        buffered = stream.peek(io.DEFAULT_BUFFER_SIZE)
+        if b"\n" in buffered:
+            # The pyarrow engine needs the exact column list, so take it from
+            # the header without consuming the stream
+            header_line = buffered.split(b"\n", 1)[0].rstrip(b"\r")
+            header = next(csv.reader([header_line.decode("utf-8-sig")]))
+            columns = [col for col in DATA_COLUMNS if col in header]
+            return pd.read_csv(
+                stream,
+                engine="pyarrow",
+                usecols=columns,
+                dtype={col: CSV_DTYPES[col] for col in columns if col in CSV_DTYPES},
+            )
+
+        # Header longer than the read buffer; fall back to the C parser
+        return self._read_csv_c_engine(stream)
+
+    def _read_csv_c_engine(self, stream: io.BufferedReader) -> pd.DataFrame:
+        """Parse CSV content with pandas' C engine, reading only DATA_COLUMNS"""
+        return pd.read_csv(
+            stream, usecols=lambda col: col in DATA_COLUMNS, dtype=CSV_DTYPES
+        )
+
     def upload_results_to_blob(
         self, data: Union[Dict, List], blob_name: str, format_type: str = "json"
     ) -> bool:
@@ -120,7 +409,8 @@ class AzureDietDataProcessor:
         Args:
             data: Data to upload
             blob_name: Name for the result blob
-            format_type: Format to save data in ('json' or 'csv')
+            format_type: Format to save data in ('json', 'csv' or 'arrow'). 'arrow'
+                writes an Arrow IPC file from a list of records or a dict of columns
 
         Returns:
             bool: True if upload successful, False otherwise
@@ -131,14 +421,25 @@ class AzureDietDataProcessor:
             )
 
             if format_type.lower() == "json":
-                import json
-
-                content = json.dumps(data, indent=2)
+                content = orjson.dumps(
+                    data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+                )
                 content_type = "application/json"
             elif format_type.lower() == "csv" and isinstance(data, list):
                 df = pd.DataFrame(data)
                 content = df.to_csv(index=False)
                 content_type = "text/csv"
+            elif format_type.lower() == "arrow":
+                table = (
+                    pa.Table.from_pylist(data)
+                    if isinstance(data, list)
+                    else pa.Table.from_pydict(data)
+                )
+                sink = io.BytesIO()
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                content = sink.getvalue()
+                content_type = "application/vnd.apache.arrow.file"
             else:
                 raise ValueError("Unsupported format type or data structure")
 
@@ -150,6 +451,34 @@ class AzureDietDataProcessor:
             logging.error(f"Error uploading results to blob storage: {e}")
             return False
 
+    def upload_many_results(
+        self, items: List[Tuple[Union[Dict, List], str]], format_type: str = "json"
+    ) -> bool:
+        """
+        Upload several results to blob storage concurrently
+
+        Args:
+            items: (data, blob_name) pairs to upload
+            format_type: Format to save each result in (see upload_results_to_blob)
+
+        Returns:
+            bool: True if every upload succeeded, False otherwise
+        """
+        if not items:
+            return True
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(items), UPLOAD_CONCURRENCY)
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda item: self.upload_results_to_blob(*item, format_type),
+                    items,
+                )
+            )
+
+        return all(results)
+
     def _clean_data(self):
         """Clean and prepare the dataset"""
         if self.data is None:
@@ -157,20 +486,57 @@ class AzureDietDataProcessor:
 
         logging.info("Cleaning data...")
 
-        # Fill missing numeric values with mean
-        numeric_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
-        for col in numeric_cols:
-            if col in self.data.columns:
-                mean_val = self.data[col].mean()
-                self.data[col] = self.data[col].fillna(mean_val)
+        # Fill missing numeric values with mean, all columns in one call.
+        # Single precision halves the memory every nutrient reduction reads;
+        # results are widened back to float64 before rounding for the API.
+        numeric_cols = [
+            col
+            for col in ["Protein(g)", "Carbs(g)", "Fat(g)"]
+            if col in self.data.columns
+        ]
+        numeric_data = self.data[numeric_cols]
+        self.data[numeric_cols] = numeric_data.fillna(numeric_data.mean()).astype(
+            np.float32
+        )
+
+        # Fill missing categorical values with each column's mode
+        categorical_cols = [
+            col for col in ["Diet_type", "Cuisine_type"] if col in self.data.columns
+        ]
+        modes = self.data[categorical_cols].mode().reindex([0]).iloc[0]
+        self.data[categorical_cols] = self.data[categorical_cols].fillna(
+            modes.fillna("Unknown")
+        )
+
+        # Fill missing recipe names once instead of defaulting them per row
+        if "Recipe_name" in self.data.columns:
+            self.data["Recipe_name"] = (
+                self.data["Recipe_name"].fillna("Unknown").astype(ARROW_STRING)
+            )
 
-        # Fill missing categorical values
-        categorical_cols = ["Diet_type", "Cuisine_type"]
+        # Store low-cardinality text columns as integer codes plus a dictionary
         for col in categorical_cols:
+            self.data[col] = self.data[col].astype("category")
+
+        # Lowercase copies let searches skip case folding on every request
+        for col in SEARCH_COLUMNS:
             if col in self.data.columns:
-                mode_value = self.data[col].mode()
-                fill_value = mode_value[0] if len(mode_value) > 0 else "Unknown"
-                self.data[col] = self.data[col].fillna(fill_value)
+                self.data[col + LOWERCASE_SUFFIX] = (
+                    self.data[col].astype(ARROW_STRING).str.lower()
+                )
+
+        # Row positions of each diet type, so per-diet lookups skip a full scan
+        self._by_diet = (
+            self.data.groupby("Diet_type", observed=True).indices
+            if "Diet_type" in self.data.columns
+            else {}
+        )
+
+        # The summary only depends on the loaded data, so compute it once here
+        self._summary = self._build_summary()
+
+        # Macronutrient averages are shared by several endpoints; build lazily
+        self._macro_averages = None
 
         logging.info("Data cleaning completed")
 
@@ -180,39 +546,50 @@ class AzureDietDataProcessor:
             logging.warning("No data loaded")
             return {}
 
-        macro_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
-        available_cols = [col for col in macro_cols if col in self.data.columns]
-
-        if "Diet_type" not in self.data.columns or not available_cols:
-            logging.warning("Required columns not found in data")
-            return {}
-
-        result = {}
-        for diet_type in self.data["Diet_type"].unique():
-            diet_data = self.data[self.data["Diet_type"] == diet_type]
-            averages = {}
-            for col in available_cols:
-                averages[col.replace("(g)", "")] = round(diet_data[col].mean(), 2)
-            result[diet_type] = averages
+        if self._macro_averages is None:
+            macro_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+            available_cols = [col for col in macro_cols if col in self.data.columns]
+
+            if "Diet_type" not in self.data.columns or not available_cols:
+                logging.warning("Required columns not found in data")
+                return {}
+
+            averages = (
+                self.data.groupby("Diet_type", sort=False, observed=True)[
+                    available_cols
+                ]
+                .mean()
+                .astype(np.float64)
+                .round(2)
+            )
+            averages.columns = [col.replace("(g)", "") for col in available_cols]
+            self._macro_averages = averages.to_dict(orient="index")
 
-        return result
+        # Hand out copies so callers cannot alter the cached averages
+        return {
+            diet_type: dict(values)
+            for diet_type, values in self._macro_averages.items()
+        }
 
     def get_diet_comparison_data(self) -> List[Dict]:
         """Get comparison data between different diet types"""
-        averages = self.get_macronutrient_averages()
-        comparison_data = []
+        if self.data is None or "Diet_type" not in self.data.columns:
+            return []
 
-        for diet_type, macros in averages.items():
-            diet_info = {
-                "diet_type": diet_type,
-                "protein": macros.get("Protein", 0),
-                "carbs": macros.get("Carbs", 0),
-                "fat": macros.get("Fat", 0),
-                "total_recipes": len(self.data[self.data["Diet_type"] == diet_type]),
-            }
-            comparison_data.append(diet_info)
+        macro_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+        available_cols = [col for col in macro_cols if col in self.data.columns]
+        if not available_cols:
+            return []
 
-        return comparison_data
+        grouped = self.data.groupby("Diet_type", sort=False, observed=True)
+        comparison = grouped[available_cols].mean().astype(np.float64).round(2)
+        comparison.columns = [col.replace("(g)", "").lower() for col in available_cols]
+        comparison = comparison.reindex(
+            columns=["protein", "carbs", "fat"], fill_value=0
+        )
+        comparison["total_recipes"] = grouped.size()
+
+        return comparison.rename_axis("diet_type").reset_index().to_dict("records")
 
     def get_top_recipes_by_nutrient(
         self, nutrient: str = "Protein", n: int = 10
@@ -226,18 +603,34 @@ class AzureDietDataProcessor:
             logging.warning(f"Nutrient column {nutrient_col} not found")
             return []
 
-        top_recipes = self.data.nlargest(n, nutrient_col)
-
-        result = []
-        for _, recipe in top_recipes.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "diet_type": recipe.get("Diet_type", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "nutrient_value": round(recipe[nutrient_col], 2),
-                "nutrient_type": nutrient,
-            }
-            result.append(recipe_info)
+        # Find the k-th largest value by partitioning the nutrient values alone;
+        # missing values are skipped, as nlargest did
+        values = self.data[nutrient_col].to_numpy()
+        positions = np.flatnonzero(~np.isnan(values))
+        k = min(n, positions.size)
+        if k <= 0:
+            return []
+        candidates = values[positions]
+        kth = np.partition(candidates, -k)[-k]
+
+        # Rows above the cutoff, highest first and ties in row order; then the
+        # earliest rows equal to the cutoff fill the remaining slots, like nlargest
+        above = positions[candidates > kth]
+        above = above[np.lexsort((above, -values[above]))]
+        tied = positions[candidates == kth][: k - above.size]
+        top_recipes = self.data.iloc[np.concatenate([above, tied])]
+
+        result = self._to_records(
+            top_recipes,
+            {
+                "Recipe_name": "recipe_name",
+                "Diet_type": "diet_type",
+                "Cuisine_type": "cuisine_type",
+                nutrient_col: "nutrient_value",
+            },
+        )
+        for recipe_info in result:
+            recipe_info["nutrient_type"] = nutrient
 
         return result
 
@@ -250,13 +643,16 @@ class AzureDietDataProcessor:
         ):
             return {}
 
-        result = {}
-        for diet_type in self.data["Diet_type"].unique():
-            diet_data = self.data[self.data["Diet_type"] == diet_type]
-            cuisine_counts = diet_data["Cuisine_type"].value_counts().to_dict()
-            result[diet_type] = cuisine_counts
+        grouped = self.data.groupby("Diet_type", sort=False, observed=True)
+        cuisine_counts = grouped["Cuisine_type"].value_counts()
+        # Categorical value_counts also lists cuisines a diet type never uses
+        cuisine_counts = cuisine_counts[cuisine_counts > 0]
 
-        return result
+        # value_counts sorts by diet type; keep the order diet types appear in
+        return {
+            diet_type: cuisine_counts.xs(diet_type).to_dict()
+            for diet_type in grouped.size().index
+        }
 
     def get_nutrient_ranges(self) -> Dict[str, Dict[str, float]]:
         """Get min, max, and average values for each nutrient"""
@@ -264,53 +660,64 @@ class AzureDietDataProcessor:
             return {}
 
         nutrient_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
-        result = {}
+        available_cols = [col for col in nutrient_cols if col in self.data.columns]
+        if not available_cols:
+            return {}
 
-        for col in nutrient_cols:
-            if col in self.data.columns:
-                nutrient_name = col.replace("(g)", "")
-                result[nutrient_name] = {
-                    "min": round(self.data[col].min(), 2),
-                    "max": round(self.data[col].max(), 2),
-                    "average": round(self.data[col].mean(), 2),
-                    "median": round(self.data[col].median(), 2),
-                }
+        stats = (
+            self.data[available_cols]
+            .agg(["min", "max", "mean", "median"])
+            .astype(np.float64)
+            .round(2)
+        )
 
-        return result
+        return {
+            col.replace("(g)", ""): {
+                "min": stats.at["min", col],
+                "max": stats.at["max", col],
+                "average": stats.at["mean", col],
+                "median": stats.at["median", col],
+            }
+            for col in available_cols
+        }
 
     def get_diet_summary(self) -> Dict:
         """Get overall summary statistics"""
         if self.data is None:
             return {}
 
+        return dict(self._summary)
+
+    def _build_summary(self) -> Dict:
+        """Compute the summary statistics served by get_diet_summary"""
+        empty_counts = pd.Series(dtype="int64")
+        diet_counts = (
+            self.data["Diet_type"].value_counts()
+            if "Diet_type" in self.data.columns
+            else empty_counts
+        )
+        cuisine_counts = (
+            self.data["Cuisine_type"].value_counts()
+            if "Cuisine_type" in self.data.columns
+            else empty_counts
+        )
+
+        # idxmax takes the first of tied counts, which for a categorical is the
+        # lowest category, matching what mode()[0] returned
         return {
             "total_recipes": len(self.data),
-            "total_diet_types": (
-                self.data["Diet_type"].nunique()
-                if "Diet_type" in self.data.columns
-                else 0
-            ),
-            "total_cuisine_types": (
-                self.data["Cuisine_type"].nunique()
-                if "Cuisine_type" in self.data.columns
-                else 0
-            ),
+            "total_diet_types": int((diet_counts > 0).sum()),
+            "total_cuisine_types": int((cuisine_counts > 0).sum()),
             "diet_types": (
                 self.data["Diet_type"].unique().tolist()
                 if "Diet_type" in self.data.columns
                 else []
             ),
             "most_common_diet": (
-                self.data["Diet_type"].mode()[0]
-                if "Diet_type" in self.data.columns
-                and len(self.data["Diet_type"].mode()) > 0
-                else "Unknown"
+                diet_counts.idxmax() if len(diet_counts) > 0 else "Unknown"
             ),
             "most_common_cuisine": (
-                self.data["Cuisine_type"].mode()[0]
-                if "Cuisine_type" in self.data.columns
-                and len(self.data["Cuisine_type"].mode()) > 0
-                else "Unknown"
+                cuisine_counts.idxmax() if len(cuisine_counts) > 0 else "Unknown"
             ),
         }
 
@@ -319,46 +726,73 @@ class AzureDietDataProcessor:
         if self.data is None or "Diet_type" not in self.data.columns:
             return []
 
-        diet_recipes = self.data[self.data["Diet_type"] == diet_type]
-
-        result = []
-        for _, recipe in diet_recipes.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "protein": round(recipe.get("Protein(g)", 0), 2),
-                "carbs": round(recipe.get("Carbs(g)", 0), 2),
-                "fat": round(recipe.get("Fat(g)", 0), 2),
-            }
-            result.append(recipe_info)
+        diet_recipes = self.data.iloc[self._by_diet.get(diet_type, [])]
 
-        return result
+        fields = {
+            col: RECIPE_FIELDS[col] for col in RECIPE_FIELDS if col != "Diet_type"
+        }
+        return self._to_records(diet_recipes, fields)
 
     def search_recipes(
         self, search_term: str, search_field: str = "Recipe_name"
     ) -> List[Dict]:
         """Search for recipes by name or other fields"""
-        if self.data is None or search_field not in self.data.columns:
+        if (
+            self.data is None
+            or search_field not in self.data.columns
+            or search_field.endswith(LOWERCASE_SUFFIX)
+        ):
             return []
 
         # Case-insensitive search
         matching_recipes = self.data[
-            self.data[search_field].str.contains(search_term, case=False, na=False)
+            self._contains(self.data, search_field, search_term)
         ]
 
-        result = []
-        for _, recipe in matching_recipes.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "diet_type": recipe.get("Diet_type", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "protein": round(recipe.get("Protein(g)", 0), 2),
-                "carbs": round(recipe.get("Carbs(g)", 0), 2),
-                "fat": round(recipe.get("Fat(g)", 0), 2),
-            }
-            result.append(recipe_info)
+        return self._to_records(matching_recipes, RECIPE_FIELDS)
+
+    def _contains(self, frame: pd.DataFrame, field: str, term: str) -> pd.Series:
+        """Case-insensitive literal substring match against a column of frame"""
+        column = frame[field]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Match the few distinct categories, then map back through the codes;
+            # code -1 (missing) picks the trailing False
+            categories = column.cat.categories.astype(ARROW_STRING).str.lower()
+            matches = np.asarray(
+                categories.str.contains(term.lower(), regex=False, na=False),
+                dtype=bool,
+            )
+            return pd.Series(
+                np.append(matches, False)[column.cat.codes.to_numpy()],
+                index=frame.index,
+            )
 
-        return result
+        lowercase_field = field + LOWERCASE_SUFFIX
+        if lowercase_field in frame.columns:
+            return frame[lowercase_field].str.contains(
+                term.lower(), regex=False, na=False
+            )
+
+        return column.str.contains(term, case=False, regex=False, na=False)
+
+    def _to_records(self, recipes: pd.DataFrame, fields: Dict[str, str]) -> List[Dict]:
+        """
+        Convert recipe rows to a list of dicts with nutrients rounded to 2 decimals
+
+        Args:
+            recipes: Recipe rows to convert
+            fields: Mapping of source column to output field name; columns missing
+                from the data default to 0 for nutrients and "Unknown" otherwise
+        """
+        defaults = {
+            col: 0 if col.endswith("(g)") else "Unknown"
+            for col in fields
+            if col not in recipes.columns
+        }
+        records = recipes.reindex(columns=list(fields)).fillna(defaults)
+        nutrient_cols = [col for col in fields if col.endswith("(g)")]
+        records[nutrient_cols] = records[nutrient_cols].astype(np.float64).round(2)
+        return records.rename(columns=fields).to_dict(orient="records")
 
     # ===== NEW ENHANCED METHODS FOR FRONTEND DASHBOARD =====
 
@@ -406,21 +840,19 @@ class AzureDietDataProcessor:
         if self.data is None:
             return {"error": "No data available"}
 
-        # Start with all data
-        filtered_data = self.data.copy()
+        # Start with all data; the filters below build new frames, so no copy
+        filtered_data = self.data
 
         # Apply diet type filter
         if diet_type and "Diet_type" in filtered_data.columns:
             filtered_data = filtered_data[
-                filtered_data["Diet_type"].str.contains(diet_type, case=False, na=False)
+                self._contains(filtered_data, "Diet_type", diet_type)
             ]
 
         # Apply search filter
         if search_term and "Recipe_name" in filtered_data.columns:
             filtered_data = filtered_data[
-                filtered_data["Recipe_name"].str.contains(
-                    search_term, case=False, na=False
-                )
+                self._contains(filtered_data, "Recipe_name", search_term)
             ]
 
         # Calculate pagination
@@ -432,20 +864,8 @@ class AzureDietDataProcessor:
         # Get page data
         page_data = filtered_data.iloc[start_idx:end_idx]
 
-        recipes = []
-        for _, recipe in page_data.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "diet_type": recipe.get("Diet_type", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "protein": round(recipe.get("Protein(g)", 0), 2),
-                "carbs": round(recipe.get("Carbs(g)", 0), 2),
-                "fat": round(recipe.get("Fat(g)", 0), 2),
-            }
-            recipes.append(recipe_info)
-
         return {
-            "recipes": recipes,
+            "recipes": self._to_records(page_data, RECIPE_FIELDS),
             "pagination": {
                 "current_page": page,
                 "total_pages": total_pages,
@@ -499,22 +919,26 @@ class AzureDietDataProcessor:
                     "cluster_id": i,
                     "size": len(cluster_recipes),
                     "avg_protein": (
-                        round(cluster_recipes["Protein(g)"].mean(), 2)
+                        round(float(cluster_recipes["Protein(g)"].mean()), 2)
                         if "Protein(g)" in cluster_recipes.columns
                         else 0
                     ),
                     "avg_carbs": (
-                        round(cluster_recipes["Carbs(g)"].mean(), 2)
+                        round(float(cluster_recipes["Carbs(g)"].mean()), 2)
                         if "Carbs(g)" in cluster_recipes.columns
                         else 0
                     ),
                     "avg_fat": (
-                        round(cluster_recipes["Fat(g)"].mean(), 2)
+                        round(float(cluster_recipes["Fat(g)"].mean()), 2)
                         if "Fat(g)" in cluster_recipes.columns
                         else 0
                     ),
                     "common_diet_types": (
-                        cluster_recipes["Diet_type"].value_counts().head(3).to_dict()
+                        cluster_recipes["Diet_type"]
+                        .value_counts()
+                        .loc[lambda counts: counts > 0]
+                        .head(3)
+                        .to_dict()
                         if "Diet_type" in cluster_recipes.columns
                         else {}
                     ),
@@ -542,33 +966,45 @@ class AzureDietDataProcessor:
         if "Diet_type" not in self.data.columns:
             return {"error": "No diet type data available for grouping"}
 
-        groups = {}
-        for diet_type in self.data["Diet_type"].unique():
-            diet_data = self.data[self.data["Diet_type"] == diet_type]
+        # One grouped pass for sizes, averages and sample names instead of
+        # slicing the frame once per diet type
+        grouped = self.data.groupby("Diet_type", sort=False, observed=True)
+        sizes = grouped.size()
+        nutrient_cols = [
+            col
+            for col in ["Protein(g)", "Carbs(g)", "Fat(g)"]
+            if col in self.data.columns
+        ]
+        averages = grouped[nutrient_cols].mean().astype(np.float64).round(2)
+        samples = (
+            grouped.head(5)
+            .groupby("Diet_type", sort=False, observed=True)["Recipe_name"]
+            .agg(list)
+            if "Recipe_name" in self.data.columns
+            else pd.Series(dtype=object)
+        )
 
+        groups = {}
+        for diet_type, size in sizes.items():
             group_info = {
                 "group_name": diet_type,
-                "size": len(diet_data),
+                "size": int(size),
                 "avg_protein": (
-                    round(diet_data["Protein(g)"].mean(), 2)
-                    if "Protein(g)" in diet_data.columns
+                    float(averages.at[diet_type, "Protein(g)"])
+                    if "Protein(g)" in averages.columns
                     else 0
                 ),
                 "avg_carbs": (
-                    round(diet_data["Carbs(g)"].mean(), 2)
-                    if "Carbs(g)" in diet_data.columns
+                    float(averages.at[diet_type, "Carbs(g)"])
+                    if "Carbs(g)" in averages.columns
                     else 0
                 ),
                 "avg_fat": (
-                    round(diet_data["Fat(g)"].mean(), 2)
-                    if "Fat(g)" in diet_data.columns
+                    float(averages.at[diet_type, "Fat(g)"])
+                    if "Fat(g)" in averages.columns
                     else 0
                 ),
-                "sample_recipes": (
-                    diet_data["Recipe_name"].head(5).tolist()
-                    if "Recipe_name" in diet_data.columns
-                    else []
-                ),
+                "sample_recipes": samples.get(diet_type, []),
             }
             groups[diet_type.replace(" ", "_")] = group_info
 
@@ -651,7 +1087,6 @@ class AzureDietDataProcessor:
         sample_size = min(500, len(self.data))
         sample_data = self.data.sample(n=sample_size)
 
-        scatter_data = []
         colors = {}
         diet_types = (
             sample_data["Diet_type"].unique()
@@ -671,16 +1106,33 @@ class AzureDietDataProcessor:
         for i, diet in enumerate(diet_types):
             colors[diet] = color_palette[i % len(color_palette)]
 
-        for _, recipe in sample_data.iterrows():
-            diet_type = recipe.get("Diet_type", "Unknown")
-            point = {
-                "x": round(recipe[x_col], 2),
-                "y": round(recipe[y_col], 2),
+        # Build the points from whole columns rather than boxing each row
+        missing = ["Unknown"] * sample_size
+        diet_values = (
+            sample_data["Diet_type"].tolist()
+            if "Diet_type" in sample_data.columns
+            else missing
+        )
+        recipe_names = (
+            sample_data["Recipe_name"].tolist()
+            if "Recipe_name" in sample_data.columns
+            else missing
+        )
+        x_values = sample_data[x_col].astype(np.float64).round(2).tolist()
+        y_values = sample_data[y_col].astype(np.float64).round(2).tolist()
+
+        scatter_data = [
+            {
+                "x": x,
+                "y": y,
                 "diet_type": diet_type,
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
+                "recipe_name": recipe_name,
                 "color": colors.get(diet_type, "#999999"),
             }
-            scatter_data.append(point)
+            for x, y, diet_type, recipe_name in zip(
+                x_values, y_values, diet_values, recipe_names
+            )
+        ]
 
         return {
             "chart_type": "scatter",
@@ -836,8 +1288,12 @@ def main():
                 print(f"  {diet}: {macros}")
 
             # Upload results back to blob storage
-            processor.upload_results_to_blob(summary, "diet_summary.json")
-            processor.upload_results_to_blob(averages, "macronutrient_averages.json")
+            processor.upload_many_results(
+                [
+                    (summary, "diet_summary.json"),
+                    (averages, "macronutrient_averages.json"),
+                ]
+            )
 
         else:
             print("Failed to load data from blob storage")
@@ -0,0 +1,25 @@
+"""
+One-time conversion of All_Diets.csv to the Parquet file read by the function.
+
+Usage:
+    python scripts/convert_to_parquet.py [input.csv] [output.parquet]
+
+Upload the output to the diet-data container as All_Diets.parquet.
+"""
+
+import sys
+
+import pandas as pd
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else "All_Diets.csv"
+    target = sys.argv[2] if len(sys.argv) > 2 else "All_Diets.parquet"
+
+    data = pd.read_csv(source)
+    data.to_parquet(target, compression="snappy", index=False)
+    print(f"Wrote {len(data)} records to {target}")
+
+
+if __name__ == "__main__":
+    main()